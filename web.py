@@ -8,15 +8,21 @@ FastAPI server with:
 """
 
 import asyncio
-import json
+import gzip
+import itertools
 import logging
 from typing import Optional
 from datetime import datetime
+from functools import lru_cache, partial
 import os
+import time
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+import orjson
+from fastapi import FastAPI, WebSocket, HTTPException, Request, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse
+from starlette.websockets import WebSocketState
 from pydantic import BaseModel
 import uvicorn
 
@@ -53,11 +59,28 @@ def split_sms(text: str, max_len: int = 155) -> list:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Versabox v0.4-alpha")
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson (several times faster than stdlib json)"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+app = FastAPI(title="Versabox v0.4-alpha", default_response_class=OrjsonResponse)
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
 
 # Store for active calls and websocket connections
 active_calls: dict = {}
-websocket_connections: list[WebSocket] = []
+_call_counter = itertools.count()
+running_calls: set[asyncio.Task] = set()  # run_call tasks, cancelled on shutdown
+websocket_connections: set[WebSocket] = set()
+
+# Call history index - rebuilt from CALLS_DIR only when the directory changes
+HISTORY_LIMIT = 20
+_history_index: list[dict] = []
+_history_index_mtime: Optional[int] = None
+_history_index_lock = asyncio.Lock()
+_history_response_body = b"[]"  # Encoded once per rescan, served as-is between
 
 # Incoming call listener
 incoming_handler: Optional[IncomingCallHandler] = None
@@ -84,11 +107,19 @@ preloaded_conversation: Optional[LocalConversationEngine] = None
 @app.on_event("startup")
 async def startup_event():
     """Pre-load AI models and start listeners on server startup"""
-    global preloaded_conversation, main_event_loop
+    global preloaded_conversation, main_event_loop, broadcaster_task
 
     # Store main event loop for thread-safe async calls
     main_event_loop = asyncio.get_event_loop()
 
+    broadcaster_task = asyncio.create_task(broadcaster())
+
+    # Warm the call history index so the first page load doesn't pay for the scan
+    try:
+        await refresh_history_index()
+    except Exception as e:
+        logger.warning(f"Could not load call history: {e}")
+
     logger.info("Pre-loading AI models for fast call startup...")
 
     # Create and initialize conversation engine in background
@@ -138,6 +169,29 @@ async def startup_event():
             logger.warning(f"Could not auto-start incoming listener: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Cancel in-flight calls, the incoming listener and the broadcaster so nothing outlives the server"""
+    if incoming_handler:
+        incoming_handler.stop_listening()
+
+    tasks = list(running_calls)
+    for task in (incoming_listener_task, broadcaster_task):
+        if task:
+            tasks.append(task)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _on_call_task_done(task: asyncio.Task):
+    """Forget a finished run_call task, logging any error it raised"""
+    running_calls.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Call task failed: {task.exception()}")
+
+
 # Settings are now stored in the database - these functions use api_keys module
 def load_settings() -> dict:
     """Load settings from database"""
@@ -168,19 +222,131 @@ class CallHistoryItem(BaseModel):
     duration: float
 
 
+# Map ConversationState values to UI status
+STATE_STATUS_MAP = {
+    "idle": "idle",
+    "listening": "connected",
+    "processing": "speaking",
+    "speaking": "speaking",
+    "completed": "ended",
+    "failed": "failed"
+}
+
+
+# Max clients sent to concurrently before yielding back to the event loop
+BROADCAST_BATCH_SIZE = 50
+
+
+async def _send_bytes(ws: WebSocket, payload: bytes) -> bool:
+    """Send to one client, returning False if the send failed"""
+    try:
+        await ws.send_bytes(payload)
+        return True
+    except:
+        return False
+
+
 async def broadcast(message: dict):
     """Broadcast message to all connected WebSocket clients"""
-    for ws in websocket_connections[:]:
+    # Encode once - every client gets the same binary frame (UTF-8 JSON), which
+    # skips the text-frame UTF-8 validation on both ends
+    payload = orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+    open_clients = [ws for ws in websocket_connections
+                    if ws.client_state == WebSocketState.CONNECTED]
+    dead = []
+
+    # Send to clients concurrently so one slow dashboard doesn't hold up the
+    # rest. Large audiences go out in capped batches, yielding to the event
+    # loop between them so a burst of updates doesn't stall it
+    for i in range(0, len(open_clients), BROADCAST_BATCH_SIZE):
+        batch = open_clients[i:i + BROADCAST_BATCH_SIZE]
+        sent = await asyncio.gather(*(_send_bytes(ws, payload) for ws in batch),
+                                    return_exceptions=True)
+        dead.extend(ws for ws, ok in zip(batch, sent) if ok is not True)
+        if i + BROADCAST_BATCH_SIZE < len(open_clients):
+            await asyncio.sleep(0)
+
+    # Drop failed clients in one pass after sending
+    websocket_connections.difference_update(dead)
+
+
+# Every UI event (call state/transcripts, dialing/result, listener and SMS
+# monitor status, autopilot updates) goes through one long-lived sender task,
+# which keeps them in FIFO order without creating a Task per event
+broadcast_queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+BROADCAST_MAX_EVENTS = 32  # Max queued events combined into one frame
+broadcaster_task: Optional[asyncio.Task] = None
+
+
+def _put_broadcast(message: dict):
+    """Put a message on the broadcast queue (event loop thread)"""
+    try:
+        broadcast_queue.put_nowait(message)
+    except asyncio.QueueFull:
+        logger.warning(f"Broadcast queue full, dropping {message.get('type')} message")
+
+
+def queue_broadcast(message: dict):
+    """Queue a message for the broadcaster task (safe to call from any thread)"""
+    try:
+        on_loop = asyncio.get_running_loop() is main_event_loop
+    except RuntimeError:
+        on_loop = False
+
+    if on_loop:
+        _put_broadcast(message)
+    elif main_event_loop and main_event_loop.is_running():
+        # Callbacks fired from executor threads (e.g. the greeting transcript)
+        main_event_loop.call_soon_threadsafe(_put_broadcast, message)
+
+
+async def broadcaster():
+    """Send queued messages to WebSocket clients, in order, for the life of the server"""
+    while True:
+        # Events queued together (e.g. state + transcript from one AI turn)
+        # go out as one frame instead of one frame each
+        events = [await broadcast_queue.get()]
+        while len(events) < BROADCAST_MAX_EVENTS and not broadcast_queue.empty():
+            events.append(broadcast_queue.get_nowait())
+
+        if len(events) == 1:
+            message = events[0]
+        else:
+            message = {"type": "batch", "events": events}
+
         try:
-            await ws.send_json(message)
-        except:
-            websocket_connections.remove(ws)
+            await broadcast(message)
+        except Exception as e:
+            logger.error(f"Broadcast failed: {e}")
 
 
-@app.get("/", response_class=HTMLResponse)
-async def home():
-    """Serve the main UI"""
-    return """
+def broadcast_state(message_type: str, state):
+    """Agent state callback - broadcast the mapped UI status as message_type"""
+    queue_broadcast({
+        "type": message_type,
+        "status": STATE_STATUS_MAP.get(state.value, state.value)
+    })
+
+
+def broadcast_incoming_call(caller_id: str):
+    """Incoming call callback - announce the caller to the UI"""
+    queue_broadcast({
+        "type": "incoming_call",
+        "caller_id": caller_id
+    })
+
+
+def broadcast_transcript(message_type: str, role: str, text: str):
+    """Agent transcript callback - broadcast the line as message_type"""
+    queue_broadcast({
+        "type": message_type,
+        "role": role,
+        "text": text
+    })
+
+
+# Main UI page (static - encoded once below)
+INDEX_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -2102,13 +2268,16 @@ A: 9am-5pm Monday-Friday
     <script>
         let ws;
         let currentCallId = null;
+        const wsDecoder = new TextDecoder();
 
         function connectWebSocket() {
             ws = new WebSocket(`ws://${window.location.host}/ws`);
+            ws.binaryType = 'arraybuffer';
 
             ws.onmessage = (event) => {
-                const data = JSON.parse(event.data);
-                handleMessage(data);
+                // Server sends UTF-8 JSON in binary frames
+                const text = typeof event.data === 'string' ? event.data : wsDecoder.decode(event.data);
+                handleMessage(JSON.parse(text));
             };
 
             ws.onclose = () => {
@@ -2117,7 +2286,9 @@ A: 9am-5pm Monday-Friday
         }
 
         function handleMessage(data) {
-            if (data.type === 'status') {
+            if (data.type === 'batch') {
+                data.events.forEach(event => handleMessage(event));
+            } else if (data.type === 'status') {
                 updateStatus(data.status);
                 // Show active call card for SMS-triggered calls
                 if (data.source === 'sms_call' && data.status !== 'idle' && data.status !== 'ended') {
@@ -5138,19 +5309,36 @@ A: 9am-5pm Monday-Friday
 </html>
 """
 
+# Encoded (and compressed, rather than by GZipMiddleware on every page load)
+# once here. Responses themselves aren't shared - middleware mutates headers
+_INDEX_HTML_BYTES = INDEX_HTML.encode("utf-8")
+_INDEX_HTML_GZIP = gzip.compress(_INDEX_HTML_BYTES, compresslevel=9)
+
+
+@app.get("/", response_class=HTMLResponse)
+async def home(request: Request):
+    """Serve the main UI"""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return HTMLResponse(
+            content=_INDEX_HTML_GZIP,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return HTMLResponse(content=_INDEX_HTML_BYTES)
+
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket for live updates"""
     await websocket.accept()
-    websocket_connections.append(websocket)
+    websocket_connections.add(websocket)
 
     try:
-        while True:
-            # Keep connection alive
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        websocket_connections.remove(websocket)
+        # The client never sends anything - just park until it disconnects.
+        # Liveness is handled by the server's protocol-level ping/pong
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        websocket_connections.discard(websocket)
 
 
 @app.post("/api/call")
@@ -5158,7 +5346,8 @@ async def start_call(request: CallRequestModel):
     """Start a new AI phone call"""
     global incoming_handler, incoming_listener_task, shared_modem
 
-    call_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Nanosecond timestamp + process-wide counter: unique even under burst load
+    call_id = f"{time.time_ns()}_{next(_call_counter)}"
 
     # Stop incoming listener if running (modem can only do one thing at a time)
     was_listening = incoming_listener_task is not None and not incoming_listener_task.done()
@@ -5188,33 +5377,9 @@ async def start_call(request: CallRequestModel):
     # Pass shared_modem so we don't create a conflicting connection
     agent = PhoneAgentLocal(pre_initialize=False, conversation_engine=preloaded_conversation, modem=shared_modem)
 
-    # Set up callbacks for live updates
-    def on_state(state):
-        # Map ConversationState to UI status
-        status_map = {
-            "idle": "idle",
-            "listening": "connected",
-            "processing": "speaking",
-            "speaking": "speaking",
-            "completed": "ended",
-            "failed": "failed"
-        }
-        status = status_map.get(state.value, state.value)
-        asyncio.create_task(broadcast({
-            "type": "status",
-            "status": status
-        }))
-
-    def on_transcript(role, text):
-        asyncio.create_task(broadcast({
-            "type": "transcript",
-            "role": role,
-            "text": text
-        }))
-
-    # Register callbacks on the agent
-    agent.on_state_change(on_state)
-    agent.on_transcript(on_transcript)
+    # Register callbacks for live updates
+    agent.on_state_change(partial(broadcast_state, "status"))
+    agent.on_transcript(partial(broadcast_transcript, "transcript"))
 
     # Store agent
     active_calls[call_id] = agent
@@ -5222,9 +5387,10 @@ async def start_call(request: CallRequestModel):
     # Start call in background
     async def run_call():
         global incoming_handler, incoming_listener_task
+        cancelled = False
         try:
             # Broadcast dialing status
-            await broadcast({
+            queue_broadcast({
                 "type": "status",
                 "status": "dialing"
             })
@@ -5237,73 +5403,186 @@ async def start_call(request: CallRequestModel):
             ))
 
             # Send result
-            await broadcast({
+            queue_broadcast({
                 "type": "result",
                 "success": result.success,
                 "summary": result.summary,
                 "collected_info": {},  # Not used in local engine
                 "duration": result.duration_seconds
             })
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
         finally:
-            if call_id in active_calls:
-                del active_calls[call_id]
+            active_calls.pop(call_id, None)
 
-            # Restart incoming listener if it was running
-            if was_listening:
+            # Restart incoming listener if it was running (not when cancelled
+            # at shutdown - nothing would be left to stop it)
+            if was_listening and not cancelled:
                 logger.info("Restarting incoming listener after outbound call")
                 await asyncio.sleep(2)  # Give modem time to settle
                 incoming_handler = IncomingCallHandler()
                 incoming_listener_task = asyncio.create_task(incoming_handler.start_listening())
-                await broadcast({
+                queue_broadcast({
                     "type": "incoming_listener_status",
                     "listening": True
                 })
 
-    asyncio.create_task(run_call())
+    task = asyncio.create_task(run_call())
+    running_calls.add(task)
+    task.add_done_callback(_on_call_task_done)
 
-    return {"call_id": call_id, "status": "started"}
+    return OrjsonResponse({"call_id": call_id, "status": "started"})
 
 
 @app.post("/api/call/{call_id}/end")
 async def end_call(call_id: str):
     """End an active call"""
-    if call_id not in active_calls:
+    agent = active_calls.get(call_id)
+    if agent is None:
         raise HTTPException(404, "Call not found")
 
-    agent = active_calls[call_id]
     # End the call by setting flag and hanging up
     agent._call_active = False
     try:
-        agent.modem.hangup()
+        # AT command exchange can take hundreds of ms - keep it off the event loop
+        await asyncio.to_thread(agent.modem.hangup)
     except:
         pass
-    return {"status": "ended"}
+    return OrjsonResponse({"status": "ended"})
 
 
-@app.get("/api/history")
-async def get_history():
-    """Get call history"""
+def _read_call_log(path: str) -> dict:
+    """Read and parse a single call log (blocking - run off the event loop)"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def _list_call_logs() -> list:
+    """List call log entries in CALLS_DIR, newest first"""
+    # Log names are timestamped, so sorting by name gives newest first
+    # without stat'ing every file
+    with os.scandir(config.CALLS_DIR) as it:
+        entries = [entry for entry in it if entry.name.endswith('.json')]
+    entries.sort(key=lambda entry: entry.name, reverse=True)
+    return entries
+
+
+@lru_cache(maxsize=512)
+def _project_history_entry(path: str, mtime_ns: int, size: int) -> Optional[dict]:
+    """
+    Read a call log and project it to a history item, or None if it can't be
+    parsed.
+
+    Cached on (path, mtime_ns, size) so a rescan only re-reads logs that are
+    new or have changed since they were last read - size catches rewrites
+    that land within the filesystem's mtime granularity. Parse failures are
+    cached too, so a corrupt log isn't re-read on every rescan.
+    """
+    try:
+        data = _read_call_log(path)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {
+        "id": os.path.basename(path),
+        "timestamp": data.get("timestamp", ""),
+        "phone": data.get("phone", ""),
+        "objective": data.get("objective", ""),
+        "success": data.get("success", False),
+        "summary": data.get("summary", ""),
+        "duration": data.get("duration_seconds", 0)
+    }
+
+
+# A log that fails to parse within this long of its last write may still be
+# being written, so the scan is retried; older failures are treated as corrupt
+HISTORY_WRITE_GRACE_NS = 5_000_000_000
+
+
+def _read_history_entry(entry: os.DirEntry) -> tuple[Optional[dict], bool]:
+    """
+    Read one call log as a history item.
+
+    Returns:
+        (item, settled) - item is None if the log can't be read or parsed;
+        settled is False if it failed but may still be being written
+    """
+    try:
+        st = entry.stat()
+        item = _project_history_entry(entry.path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None, True  # Removed since listing - the directory mtime changed
+    if item is None:
+        return None, time.time_ns() - st.st_mtime_ns > HISTORY_WRITE_GRACE_NS
+    return item, True
+
+
+async def _scan_call_history() -> tuple[list, bool]:
+    """
+    Read call logs from CALLS_DIR, newest first.
+
+    Disk reads happen in worker threads so an active call's audio/broadcast
+    tasks aren't stalled behind file I/O.
+
+    Returns:
+        (history, complete) - complete is False if a recently written log
+        couldn't be parsed (it may still be being written), so the caller
+        knows not to trust the result for long
+    """
     history = []
+    complete = True
+
+    entries = await asyncio.to_thread(_list_call_logs)
+
+    # Only the newest HISTORY_LIMIT logs are ever shown, so read just those -
+    # concurrently, so latency is the slowest read rather than the sum - and
+    # only go further back to replace logs that couldn't be parsed
+    i = 0
+    while i < len(entries) and len(history) < HISTORY_LIMIT:
+        batch = entries[i:i + HISTORY_LIMIT - len(history)]
+        i += len(batch)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(_read_history_entry, entry) for entry in batch)
+        )
+        for item, settled in results:
+            if item is not None:
+                history.append(item)
+            elif not settled:
+                complete = False
 
-    if os.path.exists(config.CALLS_DIR):
-        for filename in sorted(os.listdir(config.CALLS_DIR), reverse=True):
-            if filename.endswith('.json'):
-                try:
-                    with open(os.path.join(config.CALLS_DIR, filename)) as f:
-                        data = json.load(f)
-                        history.append({
-                            "id": filename,
-                            "timestamp": data.get("timestamp", ""),
-                            "phone": data.get("phone", ""),
-                            "objective": data.get("objective", ""),
-                            "success": data.get("success", False),
-                            "summary": data.get("summary", ""),
-                            "duration": data.get("duration_seconds", 0)
-                        })
-                except:
-                    pass
+    return history, complete
+
+
+async def refresh_history_index() -> bytes:
+    """
+    Rescan CALLS_DIR into the history index if it changed since the last scan.
+
+    Returns:
+        The encoded history list (last 20 calls)
+    """
+    global _history_index, _history_index_mtime, _history_response_body
+
+    try:
+        calls_dir_mtime = os.stat(config.CALLS_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return b"[]"
+
+    # Only rescan when a call log has been added/removed since the last scan
+    async with _history_index_lock:
+        if calls_dir_mtime != _history_index_mtime:
+            _history_index, complete = await _scan_call_history()
+            _history_index_mtime = calls_dir_mtime if complete else None
+            _history_response_body = orjson.dumps(_history_index)
+
+    return _history_response_body
 
-    return history[:20]  # Last 20 calls
+
+@app.get("/api/history")
+async def get_history():
+    """Get call history"""
+    return Response(content=await refresh_history_index(), media_type="application/json")
 
 
 @app.get("/api/call/{call_id}")
@@ -5315,20 +5594,19 @@ async def get_call_details(call_id: str):
         raise HTTPException(404, "Call not found")
 
     try:
-        with open(file_path) as f:
-            data = json.load(f)
-            return {
-                "id": call_id,
-                "timestamp": data.get("timestamp", ""),
-                "phone": data.get("phone", ""),
-                "objective": data.get("objective", ""),
-                "context": data.get("context", {}),
-                "success": data.get("success", False),
-                "summary": data.get("summary", ""),
-                "transcript": data.get("transcript", []),
-                "duration": data.get("duration_seconds", 0),
-                "recording_path": data.get("recording_path", "")
-            }
+        data = await asyncio.to_thread(_read_call_log, file_path)
+        return OrjsonResponse({
+            "id": call_id,
+            "timestamp": data.get("timestamp", ""),
+            "phone": data.get("phone", ""),
+            "objective": data.get("objective", ""),
+            "context": data.get("context", {}),
+            "success": data.get("success", False),
+            "summary": data.get("summary", ""),
+            "transcript": data.get("transcript", []),
+            "duration": data.get("duration_seconds", 0),
+            "recording_path": data.get("recording_path", "")
+        })
     except Exception as e:
         raise HTTPException(500, f"Failed to read call: {str(e)}")
 
@@ -5375,9 +5653,12 @@ async def get_incoming_status():
     is_listening = (incoming_listener_task is not None and
                     not incoming_listener_task.done())
 
+    settings = load_settings()
+    incoming_enabled = settings.get("incoming", {}).get("ENABLED", False)
+
     return {
         "listening": is_listening,
-        "enabled": load_settings().get("incoming", {}).get("ENABLED", False)
+        "enabled": incoming_enabled
     }
 
 
@@ -5399,42 +5680,14 @@ async def start_incoming_listener():
     incoming_handler = IncomingCallHandler()
 
     # Set up callbacks
-    def on_incoming(caller_id):
-        asyncio.create_task(broadcast({
-            "type": "incoming_call",
-            "caller_id": caller_id
-        }))
-
-    def on_state(state):
-        status_map = {
-            "idle": "idle",
-            "listening": "connected",
-            "processing": "speaking",
-            "speaking": "speaking",
-            "completed": "ended",
-            "failed": "failed"
-        }
-        status = status_map.get(state.value, state.value)
-        asyncio.create_task(broadcast({
-            "type": "incoming_status",
-            "status": status
-        }))
-
-    def on_transcript(role, text):
-        asyncio.create_task(broadcast({
-            "type": "incoming_transcript",
-            "role": role,
-            "text": text
-        }))
-
-    incoming_handler.on_incoming_call(on_incoming)
-    incoming_handler.on_state_change(on_state)
-    incoming_handler.on_transcript(on_transcript)
+    incoming_handler.on_incoming_call(broadcast_incoming_call)
+    incoming_handler.on_state_change(partial(broadcast_state, "incoming_status"))
+    incoming_handler.on_transcript(partial(broadcast_transcript, "incoming_transcript"))
 
     # Start listener in background
     incoming_listener_task = asyncio.create_task(incoming_handler.start_listening())
 
-    await broadcast({
+    queue_broadcast({
         "type": "incoming_listener_status",
         "listening": True
     })
@@ -5460,7 +5713,7 @@ async def stop_incoming_listener():
 
     incoming_handler = None
 
-    await broadcast({
+    queue_broadcast({
         "type": "incoming_listener_status",
         "listening": False
     })
@@ -5720,58 +5973,35 @@ async def start_sms_monitor():
                                         conversation_engine=preloaded_conversation
                                     )
 
-                                    # Use the stored main event loop for broadcasting
-                                    global main_event_loop
-
                                     # Register transcript callback to broadcast to dashboard
                                     def on_sms_call_transcript(role, text):
-                                        if main_event_loop and main_event_loop.is_running():
-                                            asyncio.run_coroutine_threadsafe(
-                                                broadcast({
-                                                    "type": "transcript",
-                                                    "role": role,
-                                                    "text": text,
-                                                    "source": "sms_call",
-                                                    "phone": pending.get('phone', '')
-                                                }),
-                                                main_event_loop
-                                            )
+                                        queue_broadcast({
+                                            "type": "transcript",
+                                            "role": role,
+                                            "text": text,
+                                            "source": "sms_call",
+                                            "phone": pending.get('phone', '')
+                                        })
 
                                     def on_sms_call_state(state):
-                                        status_map = {
-                                            "idle": "idle",
-                                            "listening": "connected",
-                                            "processing": "speaking",
-                                            "speaking": "speaking",
-                                            "completed": "ended",
-                                            "failed": "failed"
-                                        }
-                                        status = status_map.get(state.value, state.value)
-                                        if main_event_loop and main_event_loop.is_running():
-                                            asyncio.run_coroutine_threadsafe(
-                                                broadcast({
-                                                    "type": "status",
-                                                    "status": status,
-                                                    "source": "sms_call",
-                                                    "phone": pending.get('phone', '')
-                                                }),
-                                                main_event_loop
-                                            )
+                                        status = STATE_STATUS_MAP.get(state.value, state.value)
+                                        queue_broadcast({
+                                            "type": "status",
+                                            "status": status,
+                                            "source": "sms_call",
+                                            "phone": pending.get('phone', '')
+                                        })
 
                                     agent.on_transcript(on_sms_call_transcript)
                                     agent.on_state_change(on_sms_call_state)
 
                                     # Broadcast that a call is starting
-                                    if main_event_loop and main_event_loop.is_running():
-                                        asyncio.run_coroutine_threadsafe(
-                                            broadcast({
-                                                "type": "sms_call_started",
-                                                "phone": pending.get('phone', ''),
-                                                "contact_name": pending.get('contact_name', ''),
-                                                "objective": pending.get('objective', '')
-                                            }),
-                                            main_event_loop
-                                        )
+                                    queue_broadcast({
+                                        "type": "sms_call_started",
+                                        "phone": pending.get('phone', ''),
+                                        "contact_name": pending.get('contact_name', ''),
+                                        "objective": pending.get('objective', '')
+                                    })
 
                                     call_settings = load_settings()
 
@@ -5823,18 +6053,14 @@ async def start_sms_monitor():
                                     # SMS summary is already sent by agent_local._send_sms_summary()
 
                                     # Broadcast call result to dashboard
-                                    if main_event_loop and main_event_loop.is_running():
-                                        asyncio.run_coroutine_threadsafe(
-                                            broadcast({
-                                                "type": "result",
-                                                "success": result.success,
-                                                "summary": result.summary,
-                                                "source": "sms_call",
-                                                "phone": pending.get('phone', ''),
-                                                "contact_name": pending.get('contact_name', '')
-                                            }),
-                                            main_event_loop
-                                        )
+                                    queue_broadcast({
+                                        "type": "result",
+                                        "success": result.success,
+                                        "summary": result.summary,
+                                        "source": "sms_call",
+                                        "phone": pending.get('phone', ''),
+                                        "contact_name": pending.get('contact_name', '')
+                                    })
 
                                     # After call completes, verify modem is still connected
                                     if not modem.is_connected:
@@ -5902,7 +6128,7 @@ async def stop_sms_monitor():
 
     sms_handler = None
 
-    await broadcast({
+    queue_broadcast({
         "type": "sms_monitor_status",
         "monitoring": False
     })
@@ -6107,7 +6333,7 @@ async def approve_autopilot_response(queue_id: int):
     # TODO: Actually send the message via modem/email
     # For now, just mark as approved - background processor will handle sending
 
-    await broadcast({
+    queue_broadcast({
         "type": "autopilot_approved",
         "queue_id": queue_id,
         "contact_address": entry.get("contact_address")
@@ -6122,7 +6348,7 @@ async def cancel_autopilot_response(queue_id: int):
     if not database.cancel_autopilot_response(queue_id):
         raise HTTPException(404, "Autopilot response not found or already processed")
 
-    await broadcast({
+    queue_broadcast({
         "type": "autopilot_cancelled",
         "queue_id": queue_id
     })
@@ -7022,7 +7248,8 @@ def main():
     print("\nOpen http://localhost in your browser")
     print("=" * 60 + "\n")
 
-    uvicorn.run(app, host="0.0.0.0", port=80)
+    uvicorn.run(app, host="0.0.0.0", port=80, loop="uvloop", http="httptools", ws="websockets",
+                ws_ping_interval=20, ws_ping_timeout=20)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,30 @@
 """
 Web Search Integration
 
-Provides web search capability using Google Custom Search API.
+Provides web search capability using Google Custom Search API, failing
+over to SerpAPI (and, if enabled, DuckDuckGo) when Google errors or runs
+out of quota.
 Allows the AI to look up current information during calls.
+
+Keys are read from the "api_keys" section of settings.json:
+    GOOGLE_API_KEY, GOOGLE_CSE_ID  - Google Custom Search
+    SERPAPI_API_KEY                - SerpAPI fallback (optional)
+    SEARCH_DUCKDUCKGO_FALLBACK     - true to fall back to DuckDuckGo (optional)
 """
 
 import logging
-import json
-from typing import Optional, List, Dict, Any
+from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Any, ClassVar
 import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -16,88 +32,113 @@ logger = logging.getLogger(__name__)
 SETTINGS_FILE = os.path.join(os.path.dirname(__file__), "settings.json")
 
 
-def _load_settings() -> dict:
-    """Load settings from file"""
-    if os.path.exists(SETTINGS_FILE):
-        try:
-            with open(SETTINGS_FILE) as f:
-                return json.load(f)
-        except:
-            pass
-    return {}
+def _read_file(path: str) -> memoryview:
+    """Read a whole file with one unbuffered read into a buffer sized from fstat"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        buf = bytearray(os.fstat(fd).st_size)
+        view = memoryview(buf)
+        read = 0
+        while read < len(buf):
+            n = os.readv(fd, [view[read:]])
+            if n == 0:
+                break  # File shrank since fstat
+            read += n
+        return view[:read]
+    finally:
+        os.close(fd)
 
 
-def get_search_config() -> tuple:
-    """
-    Get Google Custom Search configuration from settings.
+# Parsed settings, re-read only when the file's mtime changes
+_settings_cache = {"mtime": None, "data": {}, "error_until": 0.0}
 
-    Returns:
-        (api_key, cse_id) tuple, or (None, None) if not configured
-    """
-    settings = _load_settings()
-    api_keys = settings.get("api_keys", {})
+# After a failed read, keep serving the last good settings for this long
+# instead of re-reading a broken file on every call
+SETTINGS_ERROR_RETRY = 5.0
 
-    api_key = api_keys.get("GOOGLE_API_KEY", "")
-    cse_id = api_keys.get("GOOGLE_CSE_ID", "")
 
-    if not api_key or not cse_id:
-        return None, None
+def _load_settings() -> dict:
+    """Load settings from file (cached until the file changes)"""
+    global _settings_cache
 
-    return api_key, cse_id
+    if time.monotonic() < _settings_cache["error_until"]:
+        return _settings_cache["data"]
 
+    try:
+        mtime = os.stat(SETTINGS_FILE).st_mtime_ns
+    except OSError:
+        return {}
 
-def is_search_configured() -> bool:
-    """Check if web search is properly configured"""
-    api_key, cse_id = get_search_config()
-    return bool(api_key and cse_id)
+    if mtime == _settings_cache["mtime"]:
+        return _settings_cache["data"]
 
+    try:
+        data = orjson.loads(_read_file(SETTINGS_FILE))
+    except (OSError, ValueError) as e:
+        logger.warning("Could not load %s: %s", SETTINGS_FILE, e)
+        _settings_cache = {**_settings_cache, "error_until": time.monotonic() + SETTINGS_ERROR_RETRY}
+        return _settings_cache["data"]
 
-def search(
-    query: str,
-    num_results: int = 5,
-    site_restrict: str = None
-) -> List[Dict[str, Any]]:
-    """
-    Perform a Google Custom Search.
+    # Swap in a new dict so readers never see a half-updated cache
+    _settings_cache = {"mtime": mtime, "data": data, "error_until": 0.0}
+    return data
 
-    Args:
-        query: Search query
-        num_results: Number of results to return (max 10)
-        site_restrict: Optional site to restrict search to
 
-    Returns:
-        List of search results with title, link, snippet
+# =============================================================================
+# Search backends - tried in order, falling through to the next on failure
+# =============================================================================
+
+class SearchBackend(ABC):
     """
-    api_key, cse_id = get_search_config()
+    A web search provider.
 
-    if not api_key or not cse_id:
-        logger.warning("Google Custom Search not configured")
-        return []
+    Subclasses describe the request (url + params) and how to parse the
+    JSON response; the HTTP call itself is made by search().
+    """
 
-    try:
-        import requests
+    name = ""
+    url = ""
+    fallback_only = False  # Only used when another backend is configured
+
+    def is_configured(self, api_keys: dict) -> bool:
+        """Check if this backend has the keys it needs"""
+        return True
+
+    @abstractmethod
+    def build_params(self, api_keys: dict, query: str, num_results: int,
+                     site_restrict: Optional[str]) -> dict:
+        """Build query parameters for a search request"""
+        pass
 
-        # Build search URL
-        url = "https://www.googleapis.com/customsearch/v1"
+    @abstractmethod
+    def parse(self, data: dict, num_results: int) -> List[Dict[str, Any]]:
+        """Convert a response to a list of {title, link, snippet, displayLink}"""
+        pass
+
+
+class GoogleCSEBackend(SearchBackend):
+    """Google Custom Search JSON API"""
+
+    name = "google"
+    url = "https://www.googleapis.com/customsearch/v1"
+
+    def is_configured(self, api_keys: dict) -> bool:
+        return bool(api_keys.get("GOOGLE_API_KEY") and api_keys.get("GOOGLE_CSE_ID"))
+
+    def build_params(self, api_keys, query, num_results, site_restrict):
         params = {
-            "key": api_key,
-            "cx": cse_id,
+            "key": api_keys["GOOGLE_API_KEY"],
+            "cx": api_keys["GOOGLE_CSE_ID"],
             "q": query,
-            "num": min(num_results, 10)
+            "num": num_results if num_results < 10 else 10  # API max is 10
         }
 
         if site_restrict:
             params["siteSearch"] = site_restrict
 
-        response = requests.get(url, params=params, timeout=10)
+        return params
 
-        if response.status_code != 200:
-            logger.error(f"Search API error: {response.status_code}")
-            return []
-
-        data = response.json()
-
-        # Parse results
+    def parse(self, data, num_results):
         results = []
         for item in data.get("items", []):
             results.append({
@@ -106,17 +147,216 @@ def search(
                 "snippet": item.get("snippet", ""),
                 "displayLink": item.get("displayLink", "")
             })
+        return results
+
+
+class SerpAPIBackend(SearchBackend):
+    """SerpAPI (Google results via serpapi.com)"""
+
+    name = "serpapi"
+    url = "https://serpapi.com/search.json"
+
+    def is_configured(self, api_keys: dict) -> bool:
+        return bool(api_keys.get("SERPAPI_API_KEY"))
+
+    def build_params(self, api_keys, query, num_results, site_restrict):
+        if site_restrict:
+            query = f"site:{site_restrict} {query}"
+
+        return {
+            "engine": "google",
+            "api_key": api_keys["SERPAPI_API_KEY"],
+            "q": query,
+            "num": num_results
+        }
 
-        logger.info(f"Search for '{query}' returned {len(results)} results")
+    def parse(self, data, num_results):
+        results = []
+        for item in data.get("organic_results", [])[:num_results]:
+            results.append({
+                "title": item.get("title", ""),
+                "link": item.get("link", ""),
+                "snippet": item.get("snippet", ""),
+                "displayLink": item.get("displayed_link", "")
+            })
         return results
 
-    except requests.exceptions.Timeout:
-        logger.error("Search request timed out")
+
+class DuckDuckGoBackend(SearchBackend):
+    """
+    DuckDuckGo Instant Answer API - a last resort, and only if the user opts in.
+
+    It isn't a full web search (little for prices or opening hours, and
+    site: is ignored), and it sends queries to a provider the user didn't
+    set up, so it is off unless SEARCH_DUCKDUCKGO_FALLBACK is enabled.
+    """
+
+    name = "duckduckgo"
+    url = "https://api.duckduckgo.com/"
+    fallback_only = True
+
+    def is_configured(self, api_keys: dict) -> bool:
+        # Saved settings may round-trip booleans as strings
+        return str(api_keys.get("SEARCH_DUCKDUCKGO_FALLBACK", "")).strip().lower() in ("1", "true", "yes")
+
+    def build_params(self, api_keys, query, num_results, site_restrict):
+        if site_restrict:
+            query = f"site:{site_restrict} {query}"
+
+        return {"q": query, "format": "json", "no_html": 1, "skip_disambig": 1}
+
+    def parse(self, data, num_results):
+        results = []
+        if data.get("AbstractText"):
+            results.append({
+                "title": data.get("Heading", ""),
+                "link": data.get("AbstractURL", ""),
+                "snippet": data["AbstractText"],
+                "displayLink": data.get("AbstractSource", "")
+            })
+
+        for topic in data.get("RelatedTopics", []):
+            if "Text" in topic and "FirstURL" in topic:
+                results.append({
+                    "title": topic["Text"].split(" - ")[0],
+                    "link": topic["FirstURL"],
+                    "snippet": topic["Text"],
+                    "displayLink": "duckduckgo.com"
+                })
+
+        return results[:num_results]
+
+
+SEARCH_BACKENDS = [GoogleCSEBackend(), SerpAPIBackend(), DuckDuckGoBackend()]
+
+# Skip a backend for this long after it fails (quota exhausted, outage...)
+BACKEND_RETRY_AFTER = 60.0
+# Statuses that mean the backend itself is unusable (bad key, quota, outage) -
+# anything else, e.g. a 400 for one malformed query, only fails that query
+BACKEND_DOWN_STATUSES = {401, 403, 429}
+_backend_down_until: Dict[str, float] = {}
+
+# (settings dict it was derived from, configured backends)
+_configured_backends_cache = (None, [])
+
+
+def _configured_backends() -> List[SearchBackend]:
+    """Backends with their keys set, or [] if no primary backend is configured"""
+    global _configured_backends_cache
+
+    settings = _load_settings()
+    source, backends = _configured_backends_cache
+    if settings is source:
+        return backends
+
+    api_keys = settings.get("api_keys", {})
+    backends = [backend for backend in SEARCH_BACKENDS if backend.is_configured(api_keys)]
+    if all(backend.fallback_only for backend in backends):
+        backends = []
+
+    _configured_backends_cache = (settings, backends)
+    return backends
+
+
+def _search_plan() -> List[SearchBackend]:
+    """Configured backends in try order, skipping any that failed recently"""
+    backends = _configured_backends()
+    now = time.monotonic()
+    healthy = [backend for backend in backends
+               if _backend_down_until.get(backend.name, 0.0) <= now]
+    # Everything recently failed - try them all rather than give up
+    return healthy or backends
+
+
+def _mark_down(backend: SearchBackend):
+    """Take a failing backend out of rotation for BACKEND_RETRY_AFTER seconds"""
+    _backend_down_until[backend.name] = time.monotonic() + BACKEND_RETRY_AFTER
+
+
+def _handle_response(backend: SearchBackend, query: str, status_code: int,
+                     content: bytes, num_results: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parse a backend response.
+
+    Returns None (and marks the backend down) if the backend is failing, so
+    the caller tries the next one, or [] if only this query was rejected.
+    """
+    if status_code != 200:
+        logger.error("Search API error (%s): %d", backend.name, status_code)
+        if status_code in BACKEND_DOWN_STATUSES or status_code >= 500:
+            _mark_down(backend)
+            return None
         return []
+
+    try:
+        results = backend.parse(orjson.loads(content), num_results)
     except Exception as e:
-        logger.error(f"Search error: {e}")
+        logger.error("Search error (%s): %s", backend.name, e)
+        _mark_down(backend)
+        return None
+
+    logger.info("Search for '%s' returned %d results (%s)", query, len(results), backend.name)
+    return results
+
+
+def is_search_configured() -> bool:
+    """Check if web search is properly configured"""
+    return bool(_configured_backends())
+
+
+# Shared HTTP session - keeps provider TLS connections alive between
+# searches instead of handshaking on every request
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+def search(
+    query: str,
+    num_results: int = 5,
+    site_restrict: str = None
+) -> List[Dict[str, Any]]:
+    """
+    Perform a web search, failing over between configured backends.
+
+    Args:
+        query: Search query
+        num_results: Number of results to return (max 10)
+        site_restrict: Optional site to restrict search to
+
+    Returns:
+        List of search results with title, link, snippet
+    """
+    backends = _search_plan()
+
+    if not backends:
+        logger.warning("Web search not configured")
         return []
 
+    api_keys = _load_settings().get("api_keys", {})
+
+    for backend in backends:
+        try:
+            params = backend.build_params(api_keys, query, num_results, site_restrict)
+            response = _session.get(backend.url, params=params, timeout=10)
+        except requests.exceptions.Timeout:
+            logger.error("Search request timed out (%s)", backend.name)
+            _mark_down(backend)
+            continue
+        except requests.exceptions.RequestException as e:
+            logger.error("Search error (%s): %s", backend.name, e)
+            _mark_down(backend)
+            continue
+        except Exception as e:
+            logger.error("Search error (%s): %s", backend.name, e)
+            continue
+
+        results = _handle_response(backend, query, response.status_code,
+                                   response.content, num_results)
+        if results is not None:
+            return results
+
+    return []
+
 
 def search_and_summarize(query: str, num_results: int = 3) -> str:
     """
@@ -134,14 +374,14 @@ def search_and_summarize(query: str, num_results: int = 3) -> str:
     if not results:
         return ""
 
-    lines = [f"WEB SEARCH RESULTS for '{query}':"]
+    # One formatted block per result, joined once
+    parts = [f"WEB SEARCH RESULTS for '{query}':"]
+    parts.extend(
+        f"\n\n{i}. {result['title']}\n   {result['snippet']}\n   Source: {result['displayLink']}"
+        for i, result in enumerate(results, 1)
+    )
 
-    for i, result in enumerate(results, 1):
-        lines.append(f"\n{i}. {result['title']}")
-        lines.append(f"   {result['snippet']}")
-        lines.append(f"   Source: {result['displayLink']}")
-
-    return "\n".join(lines)
+    return "".join(parts)
 
 
 def get_current_info(topic: str) -> str:
@@ -166,6 +406,38 @@ def get_current_info(topic: str) -> str:
     return search_and_summarize(topic, num_results=3)
 
 
+# How long WebSearchTool keeps results - shorter for answers that go stale fast
+SEARCH_CACHE_TTL = 3600
+SEARCH_CACHE_TTL_VOLATILE = 300
+SEARCH_CACHE_TTL_EMPTY = 30
+VOLATILE_QUERY_WORDS = ("current", "today", "latest", "price", "hours", "in stock", "availability")
+
+
+def _cache_ttl(cache_key: str) -> int:
+    """Cache lifetime in seconds for a (case-folded) query"""
+    if any(word in cache_key for word in VOLATILE_QUERY_WORDS):
+        return SEARCH_CACHE_TTL_VOLATILE
+    return SEARCH_CACHE_TTL
+
+
+# Phrases in the AI's speech that suggest a lookup would help
+SEARCH_TRIGGERS = [
+    "look that up",
+    "check on that",
+    "current price",
+    "latest info",
+    "today's hours",
+    "availability",
+    "in stock"
+]
+
+# All triggers in one pattern - a single scan instead of one `in` per phrase
+_SEARCH_TRIGGER_RE = re.compile(
+    "|".join(re.escape(trigger) for trigger in SEARCH_TRIGGERS),
+    re.IGNORECASE
+)
+
+
 # Integration with LLM for dynamic searches during calls
 class WebSearchTool:
     """
@@ -175,9 +447,16 @@ class WebSearchTool:
     the AI needs current information.
     """
 
-    def __init__(self):
-        self.enabled = is_search_configured()
-        self.cache = {}  # Simple in-memory cache
+    # Shared by all instances so a query made in one session is a cache hit
+    # in every other. query -> (expires_at, result), most recently used last
+    _cache: ClassVar[OrderedDict] = OrderedDict()
+    _cache_lock: ClassVar[threading.Lock] = threading.Lock()
+    cache_size: ClassVar[int] = 128
+
+    @property
+    def enabled(self) -> bool:
+        """Whether search is configured right now (settings may change mid-session)"""
+        return is_search_configured()
 
     def should_search(self, text: str) -> bool:
         """
@@ -188,18 +467,7 @@ class WebSearchTool:
         - "I'm not sure about current..."
         - "what's the latest..."
         """
-        search_triggers = [
-            "look that up",
-            "check on that",
-            "current price",
-            "latest info",
-            "today's hours",
-            "availability",
-            "in stock"
-        ]
-
-        text_lower = text.lower()
-        return any(trigger in text_lower for trigger in search_triggers)
+        return _SEARCH_TRIGGER_RE.search(text) is not None
 
     def search(self, query: str) -> str:
         """
@@ -215,16 +483,29 @@ class WebSearchTool:
             return ""
 
         # Check cache
-        cache_key = query.lower().strip()
-        if cache_key in self.cache:
-            return self.cache[cache_key]
-
-        # Perform search
+        # Interned so repeat queries hit the dict on an identity comparison
+        cache_key = sys.intern(query.strip().casefold())
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached:
+                expires_at, result = cached
+                if time.monotonic() < expires_at:
+                    self._cache.move_to_end(cache_key)
+                    return result
+                del self._cache[cache_key]
+
+        # Perform search (outside the lock - other lookups shouldn't wait on the network)
         result = search_and_summarize(query, num_results=3)
 
-        # Cache result
-        if result:
-            self.cache[cache_key] = result
+        # Cache result, evicting the least recently used entry when full.
+        # Empty results (no hits, API error, rate limit) are cached briefly
+        # so a burst of the same failing query costs one request
+        ttl = _cache_ttl(cache_key) if result else SEARCH_CACHE_TTL_EMPTY
+        with self._cache_lock:
+            self._cache[cache_key] = (time.monotonic() + ttl, result)
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
         return result
 
@@ -238,7 +519,7 @@ if __name__ == "__main__":
 
     if not is_search_configured():
         print("\nSearch not configured.")
-        print("Add GOOGLE_API_KEY and GOOGLE_CSE_ID in Settings > API Keys")
+        print("Add GOOGLE_API_KEY and GOOGLE_CSE_ID (or SERPAPI_API_KEY) in Settings > API Keys")
     else:
         print("\nSearch is configured. Testing...")
 